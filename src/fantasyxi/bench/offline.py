@@ -0,0 +1,116 @@
+"""
+Reemplazos offline de NBA API y ESPN para benchmarks y tests, con latencia simulada.
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import JSONDecodeError
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+from nba_api.live.nba.endpoints._base import Endpoint as LiveEndpoint
+from nba_api.stats.endpoints._base import Endpoint as StatsEndpoint
+
+from fantasyxi.stats import boxscore
+
+
+class Latency:
+    """Retardo de red simulado: `ms` fijo más jitter uniforme en [0, `jitter_ms`]."""
+
+    def __init__(self, ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.ms = ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.ms and not self.jitter_ms:
+            return
+        with self._lock:
+            delay = self.ms + self._rng.uniform(0, self.jitter_ms)
+        time.sleep(delay / 1000.0)
+
+
+@contextmanager
+def offline_nba(live: dict, stats: dict, latency: Latency | None = None):
+    """
+    Sustituye los endpoints LIVE/STATS usados por `fantasyxi.stats.boxscore`.
+
+    Los juegos sin payload LIVE fallan como un JSON vacío de la API real, lo que
+    fuerza el fallback a STATS. Las pausas anti rate-limit se anulan: el retardo
+    de red lo aporta `latency`.
+    """
+    latency = latency or Latency()
+
+    class FakeBoxScore:
+        def __init__(self, game_id, timeout=30, **kwargs):
+            latency.wait()
+            payload = live.get(game_id)
+            if payload is None:
+                raise JSONDecodeError("Expecting value", "", 0)
+            self.game = LiveEndpoint.DataSet(data=payload["game"])
+
+    class FakeBoxScoreTraditionalV2:
+        def __init__(self, game_id, timeout=30, **kwargs):
+            latency.wait()
+            sets = {rs["name"]: rs for rs in stats.get(game_id, {}).get("resultSets", [])}
+            rs = sets.get("PlayerStats", {"headers": [], "rowSet": []})
+            self.player_stats = StatsEndpoint.DataSet(data={"headers": rs["headers"], "data": rs["rowSet"]})
+
+    saved = (boxscore.live_boxscore, boxscore.stats_box, boxscore.sleep)
+    boxscore.live_boxscore = SimpleNamespace(BoxScore=FakeBoxScore)
+    boxscore.stats_box = SimpleNamespace(BoxScoreTraditionalV2=FakeBoxScoreTraditionalV2)
+    boxscore.sleep = lambda seconds: None
+    try:
+        yield
+    finally:
+        boxscore.live_boxscore, boxscore.stats_box, boxscore.sleep = saved
+
+
+@contextmanager
+def espn_fixture_server(meta_payload: dict, roster_payload: dict, latency=None, requests_log: list | None = None):
+    """
+    Servidor HTTP local que responde como la API de ligas ESPN.
+
+    `?view=mRoster` devuelve `roster_payload`; cualquier otra vista, `meta_payload`.
+    Produce la URL base para `ESPN_API_BASE`.
+
+    Args:
+        meta_payload: Respuesta para mTeam / mSettings
+        roster_payload: Respuesta para mRoster
+        latency: Objeto con `wait()` para simular red (opcional)
+        requests_log: Lista donde se agregan las vistas pedidas en cada request (opcional)
+    """
+    bodies = {
+        "roster": json.dumps(roster_payload).encode(),
+        "meta": json.dumps(meta_payload).encode(),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency is not None:
+                latency.wait()
+            views = parse_qs(urlparse(self.path).query).get("view", [])
+            if requests_log is not None:
+                requests_log.append(views)
+            body = bodies["roster"] if "mRoster" in views else bodies["meta"]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/apis/v3/games/fba"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,266 @@
+"""
+Benchmarks offline de las etapas del pipeline.
+
+Mide throughput, percentiles de latencia y memoria pico por etapa contra
+baselines guardados, y falla si alguna etapa empeora más que el umbral.
+
+Uso:
+    python -m fantasyxi.bench.run_benchmarks run --games 10 --days 3 --latency-ms 50
+    python -m fantasyxi.bench.run_benchmarks run --update-baseline
+    python -m fantasyxi.bench.run_benchmarks record 0022500039 0022500040
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from pathlib import Path
+from time import perf_counter
+import pandas as pd
+
+from fantasyxi.bench.fixtures import FIXTURES_DIR, load_recorded_slate, record_boxscore, synthetic_slate
+from fantasyxi.bench.offline import Latency, espn_fixture_server, offline_nba
+from fantasyxi.pipeline import freeze_rosters, extract_daily_stats
+from fantasyxi.stats.boxscore import boxscore_players_df, daily_stats_from_game_ids
+from fantasyxi.utils import espn_snapshot
+from fantasyxi.utils.mapping import NBA_ID_CACHE_PATH, map_nba_ids
+
+BASELINE_PATH = Path("benchmarks/baselines.json")
+STAGES = ["boxscore_players_df", "daily_stats_from_game_ids", "map_nba_ids", "roster_io", "espn_snapshot"]
+
+
+def _percentile(values: list, q: float) -> float:
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def measure_stage(calls: list, repeat: int = 3) -> dict:
+    """
+    Ejecuta una etapa y devuelve sus métricas.
+
+    Args:
+        calls: Lista de callables sin argumentos; cada uno devuelve filas procesadas
+        repeat: Repeticiones para las mediciones de tiempo
+
+    Returns:
+        Dict con calls, rows, throughput_rows_s, p50_ms, p95_ms, p99_ms, peak_mb
+    """
+    # Pasada aparte para memoria: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies, rows = [], 0
+    start = perf_counter()
+    for _ in range(repeat):
+        for call in calls:
+            t0 = perf_counter()
+            rows += call()
+            latencies.append((perf_counter() - t0) * 1000.0)
+    total = perf_counter() - start
+
+    return {
+        "calls": len(latencies),
+        "rows": rows,
+        "throughput_rows_s": rows / total if total > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def _stage_calls(stage: str, slate: list, latency: Latency) -> tuple:
+    """Devuelve (context manager, calls) para una etapa."""
+    live = {gid: p for day in slate for gid, p in day["live"].items()}
+    stats = {gid: p for day in slate for gid, p in day["stats"].items()}
+
+    if stage == "boxscore_players_df":
+        calls = [lambda gid=gid: len(boxscore_players_df(gid)) for day in slate for gid in day["game_ids"]]
+        return offline_nba(live, stats, latency), calls
+
+    if stage == "daily_stats_from_game_ids":
+        calls = [
+            lambda day=day: len(daily_stats_from_game_ids(day["game_ids"], filter_ids=day["roster"]["nba_player_id"]))
+            for day in slate
+        ]
+        return offline_nba(live, stats, latency), calls
+
+    if stage == "map_nba_ids":
+        def map_cold(day):
+            # Cache vacío: mide el peor caso (fuzzy matching completo)
+            NBA_ID_CACHE_PATH.unlink(missing_ok=True)
+            return len(map_nba_ids(day["roster"].drop(columns=["nba_player_id"])))
+        return nullcontext(), [lambda day=day: map_cold(day) for day in slate]
+
+    if stage == "roster_io":
+        def round_trip(i, day):
+            key = f"bench-{i}"
+            freeze_rosters.save_frozen_roster(day["roster"], key)
+            return len(extract_daily_stats.load_frozen_roster(key))
+        return nullcontext(), [lambda i=i, day=day: round_trip(i, day) for i, day in enumerate(slate)]
+
+    if stage == "espn_snapshot":
+        meta_payload, roster_payload = slate[0]["espn"]
+        return _espn_offline(meta_payload, roster_payload, latency), [
+            lambda: len(espn_snapshot.fetch_roster_snapshot(1, 2026))
+        ]
+
+    raise ValueError(f"Etapa desconocida: {stage}")
+
+
+@contextmanager
+def _espn_offline(meta_payload: dict, roster_payload: dict, latency: Latency):
+    """Apunta espn_snapshot al servidor de fixtures y precarga el cache de metadatos."""
+    saved_base = espn_snapshot.ESPN_API_BASE
+    with espn_fixture_server(meta_payload, roster_payload, latency) as base:
+        espn_snapshot.ESPN_API_BASE = base
+        try:
+            espn_snapshot.LEAGUE_META_CACHE_PATH.unlink(missing_ok=True)
+            espn_snapshot.load_league_meta(1, 2026)
+            yield
+        finally:
+            espn_snapshot.ESPN_API_BASE = saved_base
+
+
+def run_benchmarks(slate: list, stages: list = STAGES, repeat: int = 3, latency: Latency | None = None) -> dict:
+    """
+    Corre las etapas indicadas sobre un slate en un directorio temporal.
+
+    Las rutas de datos del pipeline son relativas, así que los caches y
+    archivos generados no tocan `data/` del repo.
+    """
+    latency = latency or Latency()
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for d in (NBA_ID_CACHE_PATH.parent, freeze_rosters.ROSTER_DIR):
+                d.mkdir(parents=True, exist_ok=True)
+            for stage in stages:
+                ctx, calls = _stage_calls(stage, slate, latency)
+                with ctx, redirect_stdout(io.StringIO()):
+                    results[stage] = measure_stage(calls, repeat)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float = 0.25, min_delta_ms: float = 1.0,
+                        min_delta_rows_s: float = 100.0, min_delta_mb: float = 0.5) -> list:
+    """
+    Compara resultados con el baseline y devuelve la lista de regresiones.
+
+    Una etapa regresa si p95 o memoria pico suben, o el throughput baja, más que
+    `threshold` (fracción) y además más que el piso absoluto de cada métrica
+    (`min_delta_ms`, `min_delta_rows_s`, `min_delta_mb`), para ignorar ruido
+    en etapas muy rápidas o livianas.
+    """
+    regressions = []
+    for stage, m in results.items():
+        b = baseline.get(stage)
+        if not b:
+            continue
+        if m["p95_ms"] > b["p95_ms"] * (1 + threshold) and m["p95_ms"] - b["p95_ms"] >= min_delta_ms:
+            regressions.append(f"{stage}: p95 {b['p95_ms']:.1f} → {m['p95_ms']:.1f} ms")
+        if (m["throughput_rows_s"] < b["throughput_rows_s"] * (1 - threshold)
+                and b["throughput_rows_s"] - m["throughput_rows_s"] >= min_delta_rows_s):
+            regressions.append(f"{stage}: throughput {b['throughput_rows_s']:.0f} → {m['throughput_rows_s']:.0f} filas/s")
+        if m["peak_mb"] > b["peak_mb"] * (1 + threshold) and m["peak_mb"] - b["peak_mb"] >= min_delta_mb:
+            regressions.append(f"{stage}: memoria pico {b['peak_mb']:.1f} → {m['peak_mb']:.1f} MB")
+    return regressions
+
+
+def _scenario_key(args) -> str:
+    """Clave del baseline: todo lo que cambia el trabajo medido o los tiempos."""
+    timing = f"s{args.seed}_l{args.latency_ms:g}_j{args.jitter_ms:g}_r{args.repeat}"
+    if args.recorded:
+        return f"recorded_{timing}"
+    return f"g{args.games}_d{args.days}_p{args.players}_{timing}"
+
+
+def _print_results(results: dict):
+    df = pd.DataFrame(results).T[["calls", "rows", "throughput_rows_s", "p50_ms", "p95_ms", "p99_ms", "peak_mb"]]
+    print(df.round(2).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks offline de FantasyXI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Corre los benchmarks")
+    run.add_argument("--games", type=int, default=8, help="Juegos por noche")
+    run.add_argument("--days", type=int, default=3, help="Días del slate")
+    run.add_argument("--players", type=int, default=13, help="Jugadores por equipo NBA")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--recorded", action="store_true", help="Usar payloads grabados en lugar de sintéticos")
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Latencia de red simulada por request")
+    run.add_argument("--jitter-ms", type=float, default=0.0, help="Jitter uniforme adicional")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    run.add_argument("--threshold", type=float, default=0.25, help="Regresión tolerada (fracción)")
+    run.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    run.add_argument("--update-baseline", action="store_true")
+
+    rec = sub.add_parser("record", help="Graba payloads LIVE/STATS reales (requiere red)")
+    rec.add_argument("game_ids", nargs="+")
+    rec.add_argument("--fixtures-dir", type=Path, default=FIXTURES_DIR)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        for gid in args.game_ids:
+            saved = record_boxscore(gid, args.fixtures_dir)
+            print(f"💾 {gid}: LIVE={'✅' if saved['live'] else '❌'} STATS={'✅' if saved['stats'] else '❌'}")
+        return 0
+
+    baseline_path = args.baseline.resolve()
+    if args.recorded:
+        slate = load_recorded_slate(FIXTURES_DIR.resolve())
+        if not slate:
+            print(f"❌ No hay payloads grabados en {FIXTURES_DIR}")
+            return 1
+    else:
+        slate = synthetic_slate(games_per_night=args.games, days=args.days,
+                                players_per_team=args.players, seed=args.seed)
+
+    key = _scenario_key(args)
+    print(f"⏱️ Escenario {key}: {sum(len(d['game_ids']) for d in slate)} juegos, {len(slate)} días")
+    results = run_benchmarks(slate, args.stages, args.repeat, Latency(args.latency_ms, args.jitter_ms, args.seed))
+    _print_results(results)
+
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+    if args.update_baseline:
+        baselines.setdefault(key, {}).update(results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baselines, indent=2))
+        print(f"💾 Baseline actualizado: {baseline_path} [{key}]")
+        return 0
+
+    if key not in baselines:
+        print(f"⚠️ Sin baseline para {key}; corre con --update-baseline para crearlo")
+        return 0
+
+    regressions = compare_to_baseline(results, baselines[key], args.threshold)
+    if regressions:
+        print(f"❌ Regresiones (umbral {args.threshold:.0%}):")
+        for r in regressions:
+            print(f"   - {r}")
+        return 1
+
+    print("✅ Sin regresiones contra el baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
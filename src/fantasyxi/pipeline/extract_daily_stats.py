@@ -10,7 +10,7 @@ import json
 import pandas as pd
 
 # ✅ Imports corregidos
-from fantasyxi.stats.boxscore import daily_stats_from_game_ids
+from fantasyxi.stats.boxscore import RAW_BOXSCORE_DIR, daily_stats_from_game_ids
 
 TZ_RD = ZoneInfo("America/Santo_Domingo")
 FREEZE_PATH = Path("data/processed/freeze_time.json")
@@ -27,6 +27,11 @@ def load_frozen_roster(freeze_date: str) -> pd.DataFrame:
     return pd.read_excel(roster_file)
 
 
+def stats_output_path(freeze_date: date) -> Path:
+    """Ruta del CSV de stats diarias: daily_stats/YYYY-MM/stats_YYYY-MM-DD.csv"""
+    return STATS_DIR / freeze_date.strftime("%Y-%m") / f"stats_{freeze_date}.csv"
+
+
 def main():
     # Leer freeze data (incluye game_ids pre-cacheados)
     freeze_data = json.loads(FREEZE_PATH.read_text())
@@ -48,10 +53,12 @@ def main():
     print(f"👥 Filtrando {len(player_ids)} jugadores rostered")
     
     # Extraer stats usando game IDs pre-cacheados (SIN llamar a ScoreboardV2)
+    # Los payloads crudos quedan en data/raw para poder re-procesarlos (ver replay.py)
     stats = daily_stats_from_game_ids(
         game_ids=game_ids,
         filter_ids=player_ids,
-        timeout=60
+        timeout=60,
+        raw_dir=RAW_BOXSCORE_DIR / freeze_date.isoformat()
     )
     
     if stats.empty:
@@ -59,9 +66,8 @@ def main():
         return
     
     # Guardar stats
-    month_dir = STATS_DIR / freeze_date.strftime("%Y-%m")
-    month_dir.mkdir(parents=True, exist_ok=True)
-    output = month_dir / f"stats_{freeze_date}.csv"
+    output = stats_output_path(freeze_date)
+    output.parent.mkdir(parents=True, exist_ok=True)
     stats.to_csv(output, index=False)
     
     print(f"📊 Stats extraídas: {len(stats)} registros → {output}")
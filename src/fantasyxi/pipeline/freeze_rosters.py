@@ -13,6 +13,7 @@ from espn_api.basketball import League
 
 # ✅ Imports corregidos (fantasyxi, no fantasyx_nba)
 from fantasyxi.utils.mapping import extract_league_players, map_nba_ids
+from fantasyxi.utils.espn_snapshot import fetch_roster_snapshot, refresh_league_meta_if_stale
 
 TZ_RD = ZoneInfo("America/Santo_Domingo")
 TZ_UTC = ZoneInfo("UTC")
@@ -49,16 +50,22 @@ def main():
         print(f"⏳ Esperando freeze time: {freeze_time.astimezone(TZ_RD)}")
         return
     
-    # Cargar liga ESPN
-    league = League(
-        league_id=int(os.getenv("ESPN_LEAGUE_ID")),
-        year=2026,
-        espn_s2=os.getenv("ESPN_S2"),
-        swid=os.getenv("ESPN_SWID")
-    )
+    league_id = int(os.getenv("ESPN_LEAGUE_ID"))
+    espn_s2 = os.getenv("ESPN_S2")
+    swid = os.getenv("ESPN_SWID")
     
-    # Extraer y mapear jugadores
-    roster = extract_league_players(league)
+    # Snapshot liviano: solo rosters (metadatos de liga desde cache)
+    try:
+        roster = fetch_roster_snapshot(league_id, 2026, espn_s2=espn_s2, swid=swid)
+        if roster.empty:
+            raise ValueError("Snapshot de rosters vacío")
+    except Exception as e:
+        # Fallback: cargar liga ESPN completa
+        print(f"⚠️ Snapshot de rosters falló: {e}, cargando liga completa...")
+        league = League(league_id=league_id, year=2026, espn_s2=espn_s2, swid=swid)
+        roster = extract_league_players(league)
+    
+    # Mapear jugadores
     roster = map_nba_ids(roster)
     
     # Guardar roster congelado
@@ -69,6 +76,13 @@ def main():
     freeze_data["processed"] = True
     FREEZE_PATH.write_text(json.dumps(freeze_data, indent=2))
     print("✅ Rosters congelados exitosamente.")
+    
+    # Ya fuera del deadline: renovar metadatos de liga si el cache está viejo
+    try:
+        if refresh_league_meta_if_stale(league_id, 2026, espn_s2=espn_s2, swid=swid):
+            print("🔄 Metadatos de liga ESPN actualizados.")
+    except Exception as e:
+        print(f"⚠️ No se pudieron actualizar metadatos ESPN: {e}")
 
 
 if __name__ == "__main__":
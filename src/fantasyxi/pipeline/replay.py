@@ -0,0 +1,138 @@
+"""
+Reconstruye las stats diarias desde payloads crudos y rosters congelados.
+Sin llamadas de red: se usa cuando cambian las reglas de normalización
+(p. ej. el fallback de MIN o el PIP de filas STATS).
+
+Uso:
+    python src/fantasyxi/pipeline/replay.py [--workers N] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+import pandas as pd
+
+from fantasyxi.stats.boxscore import RAW_BOXSCORE_DIR, boxscore_from_raw, combine_daily_frames, raw_game_ids
+from fantasyxi.pipeline.extract_daily_stats import load_frozen_roster, stats_output_path
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def write_csv_atomic(df: pd.DataFrame, path: Path):
+    """Escribe a un temporal en el mismo directorio y lo renombra: nunca queda un CSV a medias."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            df.to_csv(f, index=False)
+        # mkstemp crea con 0600; dejar los permisos que tendría un archivo normal
+        os.chmod(tmp, 0o666 & ~_current_umask())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def replay_day(day: str) -> tuple:
+    """
+    Reconstruye las stats de un día desde data/raw y su roster congelado.
+
+    Returns:
+        (día, filas escritas, ruta de salida o None si no hubo stats)
+
+    Si no hay stats no se escribe CSV, igual que en línea, y se borra el que
+    hubiera de una extracción anterior para no dejar datos con reglas viejas.
+    """
+    raw_dir = RAW_BOXSCORE_DIR / day
+    roster = load_frozen_roster(day)
+
+    frames = [boxscore_from_raw(gid, raw_dir) for gid in raw_game_ids(raw_dir)]
+    stats = combine_daily_frames([f for f in frames if not f.empty], roster["nba_player_id"].dropna())
+    output = stats_output_path(date.fromisoformat(day))
+    if stats.empty:
+        output.unlink(missing_ok=True)
+        return day, 0, None
+
+    write_csv_atomic(stats, output)
+    return day, len(stats), output
+
+
+def replayable_days(start: date | None = None, end: date | None = None) -> list:
+    """Días con payloads crudos guardados, opcionalmente dentro de [start, end]."""
+    if not RAW_BOXSCORE_DIR.exists():
+        return []
+
+    days = []
+    for p in sorted(RAW_BOXSCORE_DIR.iterdir()):
+        try:
+            d = date.fromisoformat(p.name)
+        except ValueError:
+            continue
+        if p.is_dir() and (start is None or d >= start) and (end is None or d <= end):
+            days.append(p.name)
+    return days
+
+
+def replay(days: list, workers: int | None = None) -> list:
+    """
+    Reconstruye varios días en paralelo, una partición por día.
+
+    Args:
+        days: Días en formato YYYY-MM-DD
+        workers: Procesos del pool (default: núcleos disponibles)
+
+    Returns:
+        Lista ordenada de (día, filas, ruta) de los días procesados sin error
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(replay_day, d): d for d in days}
+        for fut in as_completed(futures):
+            day = futures[fut]
+            try:
+                _, rows, output = result = fut.result()
+            except Exception as e:
+                print(f"❌ {day}: {e}")
+                continue
+            if output is None:
+                print(f"⚠️ {day}: sin stats para jugadores rostered, no se reconstruyó CSV")
+            else:
+                print(f"📊 {day}: {rows} registros → {output}")
+            results.append(result)
+    return sorted(results, key=lambda r: r[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstruye stats diarias desde payloads crudos")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (default: núcleos disponibles)")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="Primer día (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Último día (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    days = replayable_days(args.start, args.end)
+    if not days:
+        print(f"⚠️ No hay payloads crudos en {RAW_BOXSCORE_DIR}")
+        return 0
+
+    print(f"🔁 Reconstruyendo {len(days)} días desde {RAW_BOXSCORE_DIR}")
+    t0 = perf_counter()
+    results = replay(days, workers=args.workers)
+    failed = sorted(set(days) - {r[0] for r in results})
+    print(f"✅ {len(results)}/{len(days)} días reconstruidos en {perf_counter() - t0:.1f}s")
+    if failed:
+        print(f"❌ Días con error: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,23 @@ Funciones para extraer boxscores de juegos NBA.
 """
 
 import re
+import gzip
+import json
 import pandas as pd
 from datetime import date
+from pathlib import Path
 from time import sleep
 from json import JSONDecodeError
 from nba_api.live.nba.endpoints import boxscore as live_boxscore
 from nba_api.stats.endpoints import boxscoretraditionalv2 as stats_box
 
 
+RAW_BOXSCORE_DIR = Path("data/raw/boxscores")
+
+DAILY_COLUMNS = ["game_id", "NBA_TEAM", "nba_player_id", "player_name",
+                 "FGM", "FGA", "FG%", "FTM", "FTA", "FT%", "3PM", "3PA", "3P%",
+                 "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "PPM", "MIN"]
+
 _iso_pat = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?")
 
 
@@ -48,7 +57,156 @@ def safe_pct(n, d):
     return float(n) / float(d)
 
 
-def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -> pd.DataFrame:
+def save_raw_boxscore(raw_dir: Path, source: str, game_id: str, payload: dict):
+    """Guarda un payload crudo ('live' o 'stats') comprimido para poder re-procesarlo."""
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    with gzip.open(raw_dir / f"{source}_{game_id}.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+def _archive_raw_boxscore(raw_dir: Path | None, source: str, game_id: str, payload: dict):
+    """Como `save_raw_boxscore`, pero sin romper la extracción si el disco falla."""
+    if raw_dir is None:
+        return
+    try:
+        save_raw_boxscore(raw_dir, source, game_id, payload)
+    except OSError as e:
+        print(f"⚠️ No se pudo guardar el payload {source} crudo de {game_id}: {e}")
+
+
+def load_raw_boxscore(raw_dir: Path, source: str, game_id: str) -> dict | None:
+    path = raw_dir / f"{source}_{game_id}.json.gz"
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def raw_game_ids(raw_dir: Path) -> list:
+    """Game IDs con algún payload crudo guardado en `raw_dir`."""
+    return sorted({p.name.split("_", 1)[1].removesuffix(".json.gz") for p in raw_dir.glob("*_*.json.gz")})
+
+
+def parse_live_boxscore(game: dict) -> pd.DataFrame:
+    """Normaliza el dict `game` de la LIVE API. Lanza ValueError si no hay jugadores."""
+    rows = []
+    for side in ("homeTeam", "awayTeam"):
+        team = game.get(side, {})
+        tri = team.get("teamTricode")
+        for p in team.get("players", []):
+            st = p.get("statistics") or {}
+            rows.append({
+                "game_id": game.get("gameId"),
+                "NBA_TEAM": tri,
+                "nba_player_id": pd.to_numeric(p.get("personId"), errors="coerce"),
+                "player_name": p.get("name"),
+                "FGM": st.get("fieldGoalsMade"),
+                "FGA": st.get("fieldGoalsAttempted"),
+                "FG%": st.get("fieldGoalsPercentage"),
+                "FTM": st.get("freeThrowsMade"),
+                "FTA": st.get("freeThrowsAttempted"),
+                "FT%": st.get("freeThrowsPercentage"),
+                "3PM": st.get("threePointersMade"),
+                "3PA": st.get("threePointersAttempted"),
+                "3P%": st.get("threePointersPercentage"),
+                "OREB": st.get("reboundsOffensive"),
+                "DREB": st.get("reboundsDefensive"),
+                "REB": st.get("reboundsTotal"),
+                "AST": st.get("assists"),
+                "STL": st.get("steals"),
+                "BLK": st.get("blocks"),
+                "PTS": st.get("points"),
+                "PIP": st.get("pointsInThePaint"),
+                "MIN_iso_calc": st.get("minutesCalculated"),
+                "MIN_iso": st.get("minutes"),
+            })
+    df = pd.DataFrame(rows)
+    if df.empty:
+        raise ValueError("Live boxscore vacío")
+
+    df["MIN"] = df["MIN_iso_calc"].apply(iso_to_minutes).fillna(df["MIN_iso"].apply(iso_to_minutes))
+    df = df.drop(columns=[c for c in ("MIN_iso", "MIN_iso_calc") if c in df.columns])
+
+    num_cols = ["FGM", "FGA", "FTM", "FTA", "3PM", "3PA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "MIN"]
+    for c in num_cols:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    df["FG%"] = df.apply(lambda r: r["FG%"] if pd.notna(r.get("FG%")) else safe_pct(r.get("FGM"), r.get("FGA")), axis=1)
+    df["FT%"] = df.apply(lambda r: r["FT%"] if pd.notna(r.get("FT%")) else safe_pct(r.get("FTM"), r.get("FTA")), axis=1)
+    df["3P%"] = df.apply(lambda r: r["3P%"] if pd.notna(r.get("3P%")) else safe_pct(r.get("3PM"), r.get("3PA")), axis=1)
+    df["PPM"] = df.apply(lambda r: (r["PTS"]/r["MIN"]) if pd.notna(r.get("PTS")) and pd.notna(r.get("MIN")) and r["MIN"]>0 else None, axis=1)
+
+    df["nba_player_id"] = df["nba_player_id"].astype("Int64")
+    return df[[c for c in DAILY_COLUMNS if c in df.columns]]
+
+
+def parse_stats_boxscore(box: pd.DataFrame, game_id: str) -> pd.DataFrame:
+    """Normaliza el DataFrame PlayerStats de BoxScoreTraditionalV2 al esquema de LIVE."""
+    if box.empty:
+        return pd.DataFrame()
+
+    box = box.rename(columns={
+        "PLAYER_ID": "nba_player_id",
+        "PLAYER_NAME": "player_name",
+        "TEAM_ABBREVIATION": "NBA_TEAM",
+    })
+
+    keep = ["nba_player_id", "player_name", "NBA_TEAM",
+            "MIN", "FGM", "FGA", "FTM", "FTA", "FG3M", "FG3A",
+            "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS"]
+    box = box[[c for c in keep if c in box.columns]].copy()
+
+    for c in ["FGM", "FGA", "FTM", "FTA", "FG3M", "FG3A", "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS"]:
+        if c in box.columns:
+            box[c] = pd.to_numeric(box[c], errors="coerce")
+
+    if "MIN" in box.columns:
+        box["MIN"] = box["MIN"].apply(mins_mmss_to_float)
+
+    box["FG%"] = box.apply(lambda r: safe_pct(r.get("FGM"), r.get("FGA")), axis=1)
+    box["FT%"] = box.apply(lambda r: safe_pct(r.get("FTM"), r.get("FTA")), axis=1)
+    box["3PM"] = box.get("FG3M", pd.Series([None]*len(box)))
+    box["3PA"] = box.get("FG3A", pd.Series([None]*len(box)))
+    box["3P%"] = box.apply(lambda r: safe_pct(r.get("FG3M"), r.get("FG3A")), axis=1)
+    box["PIP"] = None
+    box["PPM"] = box.apply(lambda r: (r["PTS"]/r["MIN"]) if pd.notna(r.get("PTS")) and pd.notna(r.get("MIN")) and r["MIN"]>0 else None, axis=1)
+    box["nba_player_id"] = pd.to_numeric(box["nba_player_id"], errors="coerce").astype("Int64")
+    box["game_id"] = game_id
+
+    return box[[c for c in DAILY_COLUMNS if c in box.columns]]
+
+
+def _player_stats_frame(payload: dict) -> pd.DataFrame:
+    """DataFrame del result set PlayerStats de un payload crudo de STATS."""
+    for rs in payload.get("resultSets", []):
+        if rs.get("name") == "PlayerStats":
+            return pd.DataFrame(rs["rowSet"], columns=rs["headers"])
+    return pd.DataFrame()
+
+
+def boxscore_from_raw(game_id: str, raw_dir: Path) -> pd.DataFrame:
+    """
+    Reconstruye el boxscore de un juego desde payloads crudos, sin red.
+
+    Misma prioridad que `boxscore_players_df`: LIVE primero, STATS como fallback.
+    Igual que en línea, cualquier error parseando LIVE cae a STATS.
+    """
+    live = load_raw_boxscore(raw_dir, "live", game_id)
+    if live is not None:
+        try:
+            return parse_live_boxscore(live.get("game", {}))
+        except Exception:
+            pass
+
+    stats = load_raw_boxscore(raw_dir, "stats", game_id)
+    if stats is not None:
+        return parse_stats_boxscore(_player_stats_frame(stats), game_id)
+
+    return pd.DataFrame()
+
+
+def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3, raw_dir: Path | None = None) -> pd.DataFrame:
     """
     Extrae boxscore de un juego. Intenta LIVE primero, fallback a STATS.
     
@@ -56,6 +214,7 @@ def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -
         game_id: ID del juego
         timeout: Timeout en segundos (default: 60)
         max_retries: Número máximo de reintentos (default: 3)
+        raw_dir: Directorio donde guardar los payloads crudos (opcional)
     """
     
     for attempt in range(max_retries):
@@ -63,59 +222,8 @@ def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -
         try:
             bx = live_boxscore.BoxScore(game_id, timeout=timeout)
             game = bx.game.get_dict()
-            rows = []
-            for side in ("homeTeam", "awayTeam"):
-                team = game.get(side, {})
-                tri = team.get("teamTricode")
-                for p in team.get("players", []):
-                    st = p.get("statistics") or {}
-                    rows.append({
-                        "game_id": game.get("gameId"),
-                        "NBA_TEAM": tri,
-                        "nba_player_id": pd.to_numeric(p.get("personId"), errors="coerce"),
-                        "player_name": p.get("name"),
-                        "FGM": st.get("fieldGoalsMade"),
-                        "FGA": st.get("fieldGoalsAttempted"),
-                        "FG%": st.get("fieldGoalsPercentage"),
-                        "FTM": st.get("freeThrowsMade"),
-                        "FTA": st.get("freeThrowsAttempted"),
-                        "FT%": st.get("freeThrowsPercentage"),
-                        "3PM": st.get("threePointersMade"),
-                        "3PA": st.get("threePointersAttempted"),
-                        "3P%": st.get("threePointersPercentage"),
-                        "OREB": st.get("reboundsOffensive"),
-                        "DREB": st.get("reboundsDefensive"),
-                        "REB": st.get("reboundsTotal"),
-                        "AST": st.get("assists"),
-                        "STL": st.get("steals"),
-                        "BLK": st.get("blocks"),
-                        "PTS": st.get("points"),
-                        "PIP": st.get("pointsInThePaint"),
-                        "MIN_iso_calc": st.get("minutesCalculated"),
-                        "MIN_iso": st.get("minutes"),
-                    })
-            df = pd.DataFrame(rows)
-            if df.empty:
-                raise ValueError("Live boxscore vacío")
-
-            df["MIN"] = df["MIN_iso_calc"].apply(iso_to_minutes).fillna(df["MIN_iso"].apply(iso_to_minutes))
-            df = df.drop(columns=[c for c in ("MIN_iso", "MIN_iso_calc") if c in df.columns])
-
-            num_cols = ["FGM", "FGA", "FTM", "FTA", "3PM", "3PA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "MIN"]
-            for c in num_cols:
-                if c in df.columns:
-                    df[c] = pd.to_numeric(df[c], errors="coerce")
-
-            df["FG%"] = df.apply(lambda r: r["FG%"] if pd.notna(r.get("FG%")) else safe_pct(r.get("FGM"), r.get("FGA")), axis=1)
-            df["FT%"] = df.apply(lambda r: r["FT%"] if pd.notna(r.get("FT%")) else safe_pct(r.get("FTM"), r.get("FTA")), axis=1)
-            df["3P%"] = df.apply(lambda r: r["3P%"] if pd.notna(r.get("3P%")) else safe_pct(r.get("3PM"), r.get("3PA")), axis=1)
-            df["PPM"] = df.apply(lambda r: (r["PTS"]/r["MIN"]) if pd.notna(r.get("PTS")) and pd.notna(r.get("MIN")) and r["MIN"]>0 else None, axis=1)
-
-            df["nba_player_id"] = df["nba_player_id"].astype("Int64")
-            keep = ["game_id", "NBA_TEAM", "nba_player_id", "player_name",
-                    "FGM", "FGA", "FG%", "FTM", "FTA", "FT%", "3PM", "3PA", "3P%",
-                    "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "PPM", "MIN"]
-            return df[[c for c in keep if c in df.columns]]
+            _archive_raw_boxscore(raw_dir, "live", game_id, {"game": game})
+            return parse_live_boxscore(game)
 
         except (JSONDecodeError, ValueError):
             pass  # Intentar STATS API como fallback
@@ -126,10 +234,11 @@ def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -
 
         # Fallback: STATS API
         try:
-            box = stats_box.BoxScoreTraditionalV2(
+            player_stats = stats_box.BoxScoreTraditionalV2(
                 game_id=game_id,
                 timeout=timeout
-            ).player_stats.get_data_frame()
+            ).player_stats
+            box = player_stats.get_data_frame()
             
             if box.empty:
                 if attempt < max_retries - 1:
@@ -137,38 +246,11 @@ def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -
                     continue
                 return pd.DataFrame()
 
-            box = box.rename(columns={
-                "PLAYER_ID": "nba_player_id",
-                "PLAYER_NAME": "player_name",
-                "TEAM_ABBREVIATION": "NBA_TEAM",
-            })
-
-            keep = ["nba_player_id", "player_name", "NBA_TEAM",
-                    "MIN", "FGM", "FGA", "FTM", "FTA", "FG3M", "FG3A",
-                    "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS"]
-            box = box[[c for c in keep if c in box.columns]].copy()
-
-            for c in ["FGM", "FGA", "FTM", "FTA", "FG3M", "FG3A", "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS"]:
-                if c in box.columns:
-                    box[c] = pd.to_numeric(box[c], errors="coerce")
-
-            if "MIN" in box.columns:
-                box["MIN"] = box["MIN"].apply(mins_mmss_to_float)
-
-            box["FG%"] = box.apply(lambda r: safe_pct(r.get("FGM"), r.get("FGA")), axis=1)
-            box["FT%"] = box.apply(lambda r: safe_pct(r.get("FTM"), r.get("FTA")), axis=1)
-            box["3PM"] = box.get("FG3M", pd.Series([None]*len(box)))
-            box["3PA"] = box.get("FG3A", pd.Series([None]*len(box)))
-            box["3P%"] = box.apply(lambda r: safe_pct(r.get("FG3M"), r.get("FG3A")), axis=1)
-            box["PIP"] = None
-            box["PPM"] = box.apply(lambda r: (r["PTS"]/r["MIN"]) if pd.notna(r.get("PTS")) and pd.notna(r.get("MIN")) and r["MIN"]>0 else None, axis=1)
-            box["nba_player_id"] = pd.to_numeric(box["nba_player_id"], errors="coerce").astype("Int64")
-            box["game_id"] = game_id
-
-            keep_final = ["game_id", "NBA_TEAM", "nba_player_id", "player_name",
-                          "FGM", "FGA", "FG%", "FTM", "FTA", "FT%", "3PM", "3PA", "3P%",
-                          "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "PPM", "MIN"]
-            return box[[c for c in keep_final if c in box.columns]]
+            data = player_stats.get_dict()
+            _archive_raw_boxscore(raw_dir, "stats", game_id, {"resultSets": [
+                {"name": "PlayerStats", "headers": data["headers"], "rowSet": data["data"]}
+            ]})
+            return parse_stats_boxscore(box, game_id)
             
         except Exception as e:
             print(f"❌ Error en STATS API (intento {attempt + 1}): {e}")
@@ -179,6 +261,30 @@ def boxscore_players_df(game_id: str, timeout: int = 60, max_retries: int = 3) -
     return pd.DataFrame()
 
 
+def combine_daily_frames(frames: list, filter_ids: pd.Series | None = None) -> pd.DataFrame:
+    """Une los boxscores de un día, filtra jugadores y ordena por PTS/REB/AST."""
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+
+    if "nba_player_id" in df.columns:
+        df["nba_player_id"] = pd.to_numeric(df["nba_player_id"], errors="coerce").astype("Int64")
+
+    if filter_ids is not None:
+        ids = pd.to_numeric(pd.Series(filter_ids), errors="coerce").astype("Int64").dropna().unique()
+        df = df[df["nba_player_id"].isin(ids)]
+
+    keep = [c for c in DAILY_COLUMNS if c in df.columns]
+    df = df[keep].copy()
+
+    sort_cols = [c for c in ["PTS", "REB", "AST"] if c in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols, ascending=[False]*len(sort_cols))
+
+    return df.reset_index(drop=True)
+
+
 def daily_stats_by_date(day: date, filter_ids: pd.Series | None = None, timeout: int = 60) -> pd.DataFrame:
     """
     Extrae stats de todos los juegos de un día específico.
@@ -211,34 +317,13 @@ def daily_stats_by_date(day: date, filter_ids: pd.Series | None = None, timeout:
         if i < len(game_ids) - 1:
             sleep(2)
 
-    if not frames:
-        return pd.DataFrame()
-
-    df = pd.concat(frames, ignore_index=True)
-
-    if "nba_player_id" in df.columns:
-        df["nba_player_id"] = pd.to_numeric(df["nba_player_id"], errors="coerce").astype("Int64")
-
-    if filter_ids is not None:
-        ids = pd.to_numeric(pd.Series(filter_ids), errors="coerce").astype("Int64").dropna().unique()
-        df = df[df["nba_player_id"].isin(ids)]
-
-    keep = ["game_id", "NBA_TEAM", "nba_player_id", "player_name",
-            "FGM", "FGA", "FG%", "FTM", "FTA", "FT%", "3PM", "3PA", "3P%",
-            "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "PPM", "MIN"]
-    keep = [c for c in keep if c in df.columns]
-    df = df[keep].copy()
-
-    sort_cols = [c for c in ["PTS", "REB", "AST"] if c in df.columns]
-    if sort_cols:
-        df = df.sort_values(sort_cols, ascending=[False]*len(sort_cols))
-
-    return df.reset_index(drop=True)
+    return combine_daily_frames(frames, filter_ids)
 
 def daily_stats_from_game_ids(
     game_ids: list[str], 
     filter_ids: pd.Series | None = None, 
-    timeout: int = 60
+    timeout: int = 60,
+    raw_dir: Path | None = None
 ) -> pd.DataFrame:
     """
     Extrae stats usando game IDs pre-cacheados (sin llamar a ScoreboardV2).
@@ -247,6 +332,7 @@ def daily_stats_from_game_ids(
         game_ids: Lista de game IDs
         filter_ids: IDs de jugadores a filtrar (opcional)
         timeout: Timeout en segundos (default: 60)
+        raw_dir: Directorio donde guardar los payloads crudos (opcional)
         
     Returns:
         DataFrame con stats de los jugadores
@@ -260,7 +346,7 @@ def daily_stats_from_game_ids(
     frames = []
     for i, gid in enumerate(game_ids):
         print(f"📥 Extrayendo stats del juego {i+1}/{len(game_ids)}: {gid}...")
-        df_g = boxscore_players_df(gid, timeout=timeout, max_retries=3)
+        df_g = boxscore_players_df(gid, timeout=timeout, max_retries=3, raw_dir=raw_dir)
         if df_g is not None and not df_g.empty:
             frames.append(df_g)
         
@@ -268,26 +354,4 @@ def daily_stats_from_game_ids(
         if i < len(game_ids) - 1:
             sleep(2)
 
-    if not frames:
-        return pd.DataFrame()
-
-    df = pd.concat(frames, ignore_index=True)
-
-    if "nba_player_id" in df.columns:
-        df["nba_player_id"] = pd.to_numeric(df["nba_player_id"], errors="coerce").astype("Int64")
-
-    if filter_ids is not None:
-        ids = pd.to_numeric(pd.Series(filter_ids), errors="coerce").astype("Int64").dropna().unique()
-        df = df[df["nba_player_id"].isin(ids)]
-
-    keep = ["game_id", "NBA_TEAM", "nba_player_id", "player_name",
-            "FGM", "FGA", "FG%", "FTM", "FTA", "FT%", "3PM", "3PA", "3P%",
-            "OREB", "DREB", "REB", "AST", "STL", "BLK", "PTS", "PIP", "PPM", "MIN"]
-    keep = [c for c in keep if c in df.columns]
-    df = df[keep].copy()
-
-    sort_cols = [c for c in ["PTS", "REB", "AST"] if c in df.columns]
-    if sort_cols:
-        df = df.sort_values(sort_cols, ascending=[False]*len(sort_cols))
-
-    return df.reset_index(drop=True)
\ No newline at end of file
+    return combine_daily_frames(frames, filter_ids)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Snapshot liviano de rosters ESPN para el freeze.
+
+Los metadatos estáticos de la liga (equipos, owners, settings) se guardan en
+cache local; en el freeze solo se pide la vista mRoster y se parsea directo
+al mismo esquema que `extract_league_players`.
+"""
+
+import os
+import json
+import requests
+import pandas as pd
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+# Mismos mapas que usa espn_api.basketball.Player, para que ambos caminos coincidan
+from espn_api.basketball.constant import POSITION_MAP, PRO_TEAM_MAP
+
+# Permite apuntar a un servidor local de fixtures en lugar de ESPN
+ESPN_API_BASE = os.getenv("ESPN_API_BASE", "https://lm-api-reads.fantasy.espn.com/apis/v3/games/fba")
+
+LEAGUE_META_CACHE_PATH = Path("data/processed/mappings/espn_league_meta.json")
+LEAGUE_META_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+LEAGUE_META_MAX_AGE = timedelta(days=7)
+
+ROSTER_COLUMNS = ["team_id", "team_abbrev", "team_name", "player_id",
+                  "player_name", "pro_team", "lineup_slot"]
+
+def _league_url(league_id: int, year: int) -> str:
+    return f"{ESPN_API_BASE}/seasons/{year}/segments/0/leagues/{league_id}"
+
+
+def _espn_get(league_id: int, year: int, views: list, espn_s2=None, swid=None, timeout: int = 30) -> dict:
+    cookies = {"espn_s2": espn_s2, "SWID": swid} if espn_s2 and swid else None
+    r = requests.get(_league_url(league_id, year), params={"view": views}, cookies=cookies, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+def _load_meta_cache(path=LEAGUE_META_CACHE_PATH):
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_meta_cache(cache, path=LEAGUE_META_CACHE_PATH):
+    path.write_text(json.dumps(cache, ensure_ascii=False, indent=2))
+
+
+def _team_name(t: dict) -> str:
+    # Igual que espn_api: 'name' si existe, si no location + nickname
+    name = t.get("name")
+    if name:
+        return name
+    return f'{t.get("location", "")} {t.get("nickname", "")}'.strip()
+
+
+def parse_league_meta(data: dict) -> dict:
+    """Parsea la respuesta de mTeam + mSettings a los metadatos que se guardan en cache."""
+    members = {m.get("id"): m for m in data.get("members", [])}
+    teams = {}
+    for t in data.get("teams", []):
+        owners = [members.get(o, {"id": o}) for o in t.get("owners", [])]
+        teams[str(t.get("id"))] = {
+            "team_id": t.get("id"),
+            "team_abbrev": t.get("abbrev"),
+            "team_name": _team_name(t),
+            "owners": [
+                {"id": o.get("id"), "name": o.get("displayName") or
+                 f'{o.get("firstName", "")} {o.get("lastName", "")}'.strip() or "Unknown"}
+                for o in owners
+            ],
+        }
+
+    settings = data.get("settings", {})
+    return {
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "teams": teams,
+        "settings": {
+            "name": settings.get("name"),
+            "size": settings.get("size"),
+            "scoring_type": (settings.get("scoringSettings") or {}).get("scoringType"),
+        },
+    }
+
+
+def fetch_league_meta(league_id: int, year: int, espn_s2=None, swid=None, timeout: int = 30) -> dict:
+    """Descarga equipos, owners y settings de la liga (vistas mTeam + mSettings)."""
+    data = _espn_get(league_id, year, ["mTeam", "mSettings"], espn_s2, swid, timeout)
+    return parse_league_meta(data)
+
+
+def load_league_meta(league_id: int, year: int, espn_s2=None, swid=None,
+                     timeout: int = 30, refresh: bool = False) -> dict:
+    """
+    Devuelve metadatos de la liga desde cache; descarga solo si faltan o `refresh`.
+
+    No revisa la antigüedad: el freeze usa el cache aunque esté viejo y
+    `refresh_league_meta_if_stale` lo renueva fuera del camino crítico.
+    """
+    cache = _load_meta_cache()
+    key = f"{league_id}|{year}"
+    if not refresh and key in cache:
+        return cache[key]
+
+    meta = fetch_league_meta(league_id, year, espn_s2, swid, timeout)
+    cache[key] = meta
+    _save_meta_cache(cache)
+    return meta
+
+
+def refresh_league_meta_if_stale(league_id: int, year: int, espn_s2=None, swid=None, timeout: int = 30) -> bool:
+    """Renueva el cache de metadatos si tiene más de `LEAGUE_META_MAX_AGE`. Devuelve True si lo renovó."""
+    meta = _load_meta_cache().get(f"{league_id}|{year}")
+    if meta is not None:
+        fetched_at = datetime.fromisoformat(meta["fetched_at"])
+        if datetime.now(timezone.utc) - fetched_at < LEAGUE_META_MAX_AGE:
+            return False
+
+    load_league_meta(league_id, year, espn_s2, swid, timeout, refresh=True)
+    return True
+
+
+def parse_roster_payload(data: dict, meta: dict) -> pd.DataFrame:
+    """Parsea la respuesta de mRoster al esquema columnar del roster congelado."""
+    cols = {c: [] for c in ROSTER_COLUMNS}
+    teams = meta.get("teams", {})
+
+    for t in data.get("teams", []):
+        info = teams.get(str(t.get("id")), {})
+        for e in (t.get("roster") or {}).get("entries", []):
+            p = (e.get("playerPoolEntry") or {}).get("player") or {}
+            pos_id = p.get("defaultPositionId")
+            cols["team_id"].append(t.get("id"))
+            cols["team_abbrev"].append(info.get("team_abbrev"))
+            cols["team_name"].append(info.get("team_name"))
+            cols["player_id"].append(e.get("playerId", p.get("id")))
+            cols["player_name"].append(p.get("fullName"))
+            cols["pro_team"].append(PRO_TEAM_MAP.get(p.get("proTeamId")))
+            # Como espn_api Player.position: defaultPositionId - 1
+            cols["lineup_slot"].append(POSITION_MAP.get(pos_id - 1) if pos_id is not None else None)
+
+    df = pd.DataFrame(cols, columns=ROSTER_COLUMNS)
+    return df.drop_duplicates(subset=["player_id"]).reset_index(drop=True)
+
+
+def fetch_roster_snapshot(league_id: int, year: int, espn_s2=None, swid=None, timeout: int = 30) -> pd.DataFrame:
+    """
+    Obtiene los rosters de la liga pidiendo solo la vista mRoster.
+
+    Args:
+        league_id: ID de la liga ESPN
+        year: Temporada
+        espn_s2: Cookie espn_s2 (ligas privadas)
+        swid: Cookie SWID (ligas privadas)
+        timeout: Timeout en segundos (default: 30)
+
+    Returns:
+        DataFrame con las mismas columnas que `extract_league_players`
+    """
+    meta = load_league_meta(league_id, year, espn_s2, swid, timeout)
+    data = _espn_get(league_id, year, ["mRoster"], espn_s2, swid, timeout)
+
+    # Si aparece un equipo que no está en cache, refrescar metadatos una vez
+    known = set(meta.get("teams", {}))
+    if any(str(t.get("id")) not in known for t in data.get("teams", [])):
+        print("🔄 Equipo nuevo en la liga, refrescando metadatos ESPN...")
+        meta = load_league_meta(league_id, year, espn_s2, swid, timeout, refresh=True)
+
+    return parse_roster_payload(data, meta)
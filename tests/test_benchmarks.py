@@ -0,0 +1,70 @@
+"""
+Comparación contra baseline y claves de escenario de los benchmarks.
+"""
+
+import argparse
+from pathlib import Path
+
+import pytest
+
+from fantasyxi.bench.fixtures import FIXTURES_DIR, load_recorded_slate
+from fantasyxi.bench.run_benchmarks import _percentile, _scenario_key, compare_to_baseline
+
+
+def _metrics(p95_ms=10.0, throughput_rows_s=10_000.0, peak_mb=5.0):
+    return {"p95_ms": p95_ms, "throughput_rows_s": throughput_rows_s, "peak_mb": peak_mb}
+
+
+@pytest.mark.parametrize("q, expected", [(0.0, 1), (0.5, 5), (0.95, 10), (0.99, 10), (1.0, 10)])
+def test_percentile_nearest_rank(q, expected):
+    assert _percentile(list(range(10, 0, -1)), q) == expected
+
+
+def test_percentile_single_value():
+    assert _percentile([3.5], 0.99) == 3.5
+
+
+def test_no_regression_within_threshold():
+    baseline = {"stage": _metrics()}
+    assert compare_to_baseline({"stage": _metrics(12.0, 8_000.0, 6.0)}, baseline) == []
+
+
+@pytest.mark.parametrize("current, metric", [
+    (_metrics(p95_ms=20.0), "p95"),
+    (_metrics(throughput_rows_s=5_000.0), "throughput"),
+    (_metrics(peak_mb=10.0), "memoria pico"),
+])
+def test_regression_past_threshold_and_floor(current, metric):
+    regressions = compare_to_baseline({"stage": current}, {"stage": _metrics()})
+    assert len(regressions) == 1
+    assert regressions[0].startswith(f"stage: {metric}")
+
+
+@pytest.mark.parametrize("baseline, current", [
+    (_metrics(p95_ms=0.2), _metrics(p95_ms=0.6)),
+    (_metrics(throughput_rows_s=200.0), _metrics(throughput_rows_s=120.0)),
+    (_metrics(peak_mb=0.1), _metrics(peak_mb=0.4)),
+])
+def test_relative_changes_below_absolute_floor_are_noise(baseline, current):
+    assert compare_to_baseline({"stage": current}, {"stage": baseline}) == []
+
+
+def test_stage_without_baseline_is_skipped():
+    assert compare_to_baseline({"nueva": _metrics(p95_ms=1e6)}, {"stage": _metrics()}) == []
+
+
+def test_scenario_key_covers_seed_jitter_and_repeat():
+    base = dict(recorded=False, games=8, days=3, players=13, seed=0, latency_ms=0.0, jitter_ms=0.0, repeat=3)
+    keys = {
+        _scenario_key(argparse.Namespace(**{**base, **change}))
+        for change in ({}, {"seed": 1}, {"jitter_ms": 5.0}, {"repeat": 5}, {"recorded": True})
+    }
+    assert len(keys) == 5
+
+
+def test_committed_recorded_set_has_live_and_stats():
+    [day] = load_recorded_slate(Path(__file__).parents[1] / FIXTURES_DIR)
+
+    assert len(day["game_ids"]) >= 2
+    assert set(day["live"]) == set(day["stats"]) == set(day["game_ids"])
+    assert not day["roster"].empty
@@ -0,0 +1,103 @@
+"""
+El snapshot mRoster debe producir el mismo roster que el camino espn_api.League.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from espn_api.basketball.team import Team
+
+from fantasyxi.utils import espn_snapshot
+from fantasyxi.bench.offline import espn_fixture_server
+from fantasyxi.utils.mapping import extract_league_players
+
+FIXTURE = Path(__file__).parent / "fixtures" / "espn_league.json"
+LEAGUE_ID, YEAR = 123456, 2026
+
+
+def _payloads():
+    league = json.loads(FIXTURE.read_text())
+    meta = {k: v for k, v in league.items() if k != "teams"}
+    meta["teams"] = [{k: v for k, v in t.items() if k != "roster"} for t in league["teams"]]
+    roster = {"teams": [{"id": t["id"], "roster": t["roster"]} for t in league["teams"]]}
+    return league, meta, roster
+
+
+def _league_from_payload(league: dict):
+    """Equipos construidos con las mismas clases que usa espn_api.basketball.League."""
+    members = {m["id"]: m for m in league["members"]}
+    teams = [
+        Team(t, t["roster"], [], YEAR, owners=[members[o] for o in t["owners"]])
+        for t in league["teams"]
+    ]
+    return SimpleNamespace(teams=teams)
+
+
+@pytest.fixture
+def espn(tmp_path, monkeypatch):
+    """Servidor de fixtures ESPN con cache de metadatos aislado en tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    espn_snapshot.LEAGUE_META_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    league, meta, roster = _payloads()
+    log = []
+    with espn_fixture_server(meta, roster, requests_log=log) as base:
+        monkeypatch.setattr(espn_snapshot, "ESPN_API_BASE", base)
+        yield SimpleNamespace(league=league, log=log)
+
+
+def test_snapshot_matches_league_path(espn):
+    expected = extract_league_players(_league_from_payload(espn.league))
+    got = espn_snapshot.fetch_roster_snapshot(LEAGUE_ID, YEAR)
+
+    pd.testing.assert_frame_equal(got, expected)
+    # Jokic está en dos equipos: se conserva la primera aparición
+    assert got["player_id"].is_unique
+    assert got.loc[got["player_id"] == 3112335, "team_id"].tolist() == [1]
+    # Equipo sin 'name' usa location + nickname
+    assert set(got.loc[got["team_id"] == 2, "team_name"]) == {"Wyckoff Hospital"}
+
+
+def test_cached_meta_means_roster_only_request(espn):
+    espn_snapshot.load_league_meta(LEAGUE_ID, YEAR)
+    espn.log.clear()
+
+    espn_snapshot.fetch_roster_snapshot(LEAGUE_ID, YEAR)
+
+    assert espn.log == [["mRoster"]]
+
+
+def test_stale_meta_is_not_refreshed_on_freeze_path(espn):
+    espn_snapshot.load_league_meta(LEAGUE_ID, YEAR)
+    cache = json.loads(espn_snapshot.LEAGUE_META_CACHE_PATH.read_text())
+    old = datetime.now(timezone.utc) - espn_snapshot.LEAGUE_META_MAX_AGE - timedelta(days=1)
+    cache[f"{LEAGUE_ID}|{YEAR}"]["fetched_at"] = old.isoformat()
+    espn_snapshot.LEAGUE_META_CACHE_PATH.write_text(json.dumps(cache))
+    espn.log.clear()
+
+    espn_snapshot.fetch_roster_snapshot(LEAGUE_ID, YEAR)
+    assert espn.log == [["mRoster"]]
+
+    assert espn_snapshot.refresh_league_meta_if_stale(LEAGUE_ID, YEAR)
+    assert espn.log[-1] == ["mTeam", "mSettings"]
+    assert not espn_snapshot.refresh_league_meta_if_stale(LEAGUE_ID, YEAR)
+
+
+def test_unknown_team_forces_meta_refresh(espn):
+    # Cache sin el equipo 3 y con un nombre viejo para el equipo 1
+    meta = espn_snapshot.load_league_meta(LEAGUE_ID, YEAR)
+    del meta["teams"]["3"]
+    meta["teams"]["1"]["team_name"] = "Nombre viejo"
+    espn_snapshot.LEAGUE_META_CACHE_PATH.write_text(json.dumps({f"{LEAGUE_ID}|{YEAR}": meta}))
+    espn.log.clear()
+
+    got = espn_snapshot.fetch_roster_snapshot(LEAGUE_ID, YEAR)
+
+    assert espn.log == [["mRoster"], ["mTeam", "mSettings"]]
+    assert set(got.loc[got["team_id"] == 3, "team_name"]) == {"House of Mamba"}
+    assert set(got.loc[got["team_id"] == 1, "team_name"]) == {"SI LA VA A EMPAQUETA"}
+    cached = json.loads(espn_snapshot.LEAGUE_META_CACHE_PATH.read_text())[f"{LEAGUE_ID}|{YEAR}"]
+    assert "3" in cached["teams"]
@@ -0,0 +1,87 @@
+"""
+Replay desde payloads crudos debe reproducir exactamente la extracción en línea.
+"""
+
+import json
+import stat
+from datetime import date
+
+import pytest
+
+from fantasyxi.bench.fixtures import synthetic_slate
+from fantasyxi.bench.offline import offline_nba
+from fantasyxi.pipeline import extract_daily_stats, freeze_rosters, replay
+from fantasyxi.stats.boxscore import RAW_BOXSCORE_DIR, boxscore_players_df
+
+
+@pytest.fixture
+def slate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for d in (freeze_rosters.ROSTER_DIR, extract_daily_stats.STATS_DIR):
+        d.mkdir(parents=True, exist_ok=True)
+    slate = synthetic_slate(games_per_night=4, days=3, stats_fallback_rate=0.3, seed=7)
+
+    # Un payload LIVE que rompe con AttributeError (no ValueError) y tiene STATS:
+    # en línea cae a STATS, en replay debe hacer lo mismo
+    day = slate[0]
+    gid = next(g for g in day["game_ids"] if g in day["live"])
+    day["stats"][gid] = synthetic_slate(games_per_night=4, days=1, stats_fallback_rate=1.0, seed=7)[0]["stats"][gid]
+    day["live"][gid]["game"]["homeTeam"]["players"][0] = "jugador corrupto"
+    return slate
+
+
+def _extract_online(slate):
+    """Corre extract_daily_stats.main para cada día, como el workflow diario."""
+    outputs = {}
+    for day in slate:
+        freeze_rosters.save_frozen_roster(day["roster"], day["date"])
+        extract_daily_stats.FREEZE_PATH.write_text(json.dumps({"date": day["date"], "game_ids": day["game_ids"]}))
+        with offline_nba(day["live"], day["stats"]):
+            extract_daily_stats.main()
+        output = extract_daily_stats.stats_output_path(date.fromisoformat(day["date"]))
+        outputs[day["date"]] = (output.read_bytes(), stat.S_IMODE(output.stat().st_mode))
+        output.unlink()
+    return outputs
+
+
+def test_replay_reproduces_online_extraction(slate):
+    online = _extract_online(slate)
+    assert sorted(p.name for p in RAW_BOXSCORE_DIR.iterdir()) == sorted(online)
+
+    results = replay.replay(replay.replayable_days(), workers=2)
+
+    assert [r[0] for r in results] == sorted(online)
+    for day, rows, output in results:
+        content, mode = online[day]
+        assert output.read_bytes() == content
+        assert stat.S_IMODE(output.stat().st_mode) == mode
+        assert rows > 0
+
+
+def test_replay_main_reports_failed_and_empty_days(slate):
+    _extract_online(slate)
+    assert replay.main(["--workers", "1"]) == 0
+
+    failed, empty, ok = (day["date"] for day in slate)
+    (freeze_rosters.ROSTER_DIR / f"roster_{failed}.xlsx").unlink()
+    # Roster sin jugadores en los boxscores: el CSV anterior no debe sobrevivir
+    roster = slate[1]["roster"].assign(nba_player_id="0")
+    freeze_rosters.save_frozen_roster(roster, empty)
+
+    assert replay.main(["--workers", "1"]) == 1
+    assert not extract_daily_stats.stats_output_path(date.fromisoformat(empty)).exists()
+    assert extract_daily_stats.stats_output_path(date.fromisoformat(ok)).exists()
+
+
+def test_archive_failure_keeps_parsed_boxscore(tmp_path, capsys):
+    [day] = synthetic_slate(games_per_night=4, days=1, stats_fallback_rate=0.5, seed=3)
+    assert day["live"] and day["stats"]
+    # raw_dir apunta a un archivo: mkdir falla con OSError en ambos caminos
+    not_a_dir = tmp_path / "raw"
+    not_a_dir.write_text("")
+
+    with offline_nba(day["live"], day["stats"]):
+        frames = [boxscore_players_df(gid, raw_dir=not_a_dir) for gid in day["game_ids"]]
+
+    assert all(not f.empty for f in frames)
+    assert capsys.readouterr().out.count("No se pudo guardar") == len(day["game_ids"])